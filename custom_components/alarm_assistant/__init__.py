@@ -10,6 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 
 from .alarm_manager import AlarmManager
+from .alarm_storage import AlarmStorage
 from .const import ADDON_NAME
 from .llm_functions import cleanup_llm_functions, setup_llm_functions
 from .timer_manager import TimerManager
@@ -30,11 +31,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Voice Alarm Assistant from a config entry."""
     _LOGGER.info(f"Setting up {ADDON_NAME} for entry: %s", entry.entry_id)
 
+    # Open the alarm database in the executor; AlarmStorage is a singleton, so
+    # the alarm manager below reuses this instance
+    await hass.async_add_executor_job(AlarmStorage)
+
     # Initialize the alarm manager and timer manager
     alarm_manager = AlarmManager(hass)
     timer_manager = TimerManager(hass)
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN]["alarm_manager"] = alarm_manager
+    hass.data[DOMAIN]["storage"] = alarm_manager.storage
     hass.data[DOMAIN]["timer_manager"] = timer_manager
 
     # Set up LLM functions
@@ -63,8 +69,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Clean up LLM functions
     await cleanup_llm_functions(hass)
 
-    # Clean up alarm manager and timer manager from hass.data
+    # Clean up alarm manager, storage and timer manager from hass.data
     hass.data[DOMAIN].pop("alarm_manager", None)
+    hass.data[DOMAIN].pop("storage", None)
     hass.data[DOMAIN].pop("timer_manager", None)
 
     _LOGGER.info(f"{ADDON_NAME} successfully unloaded")
@@ -1,17 +1,68 @@
 """LLM Tools for controlling ringing alarms (stop, snooze)."""
+import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import voluptuous as vol
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import llm
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import JsonObjectType
 
-from .const import CONF_SNOOZE_DURATION, DEFAULT_SNOOZE_DURATION, DOMAIN
+from .alarm_storage import AlarmStorage
+from .const import CONF_SNOOZE_DURATION, DEFAULT_SNOOZE_DURATION, DOMAIN, EMPTY_CONFIG
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _make_snooze_callback(hass: HomeAssistant, alarm_manager, alarm_id: int, name: str, sound: str):
+    """Create the callback that re-triggers a snoozed alarm."""
+
+    @callback
+    def snooze_callback(now):
+        if alarm_manager:
+            # Re-trigger the alarm
+            hass.async_create_task(
+                alarm_manager._trigger_alarm(
+                    {"id": alarm_id, "name": f"Snoozed: {name}", "sound": sound}
+                ),
+                eager_start=True,
+            )
+
+    return snooze_callback
+
+
+async def _stop_media(hass: HomeAssistant):
+    """Stop the configured media player once, regardless of how many alarms ring."""
+    config_data = hass.data[DOMAIN].get("config", EMPTY_CONFIG)
+    media_player = config_data.get("media_player_entity")
+
+    if media_player:
+        await hass.services.async_call(
+            "media_player",
+            "media_stop",
+            {"entity_id": media_player},
+            blocking=False,
+        )
+
+
+async def _dismiss_notification(hass: HomeAssistant, alarm_manager, alarm_id: int):
+    """Dismiss an alarm's notification through the alarm manager's batch."""
+    if alarm_manager:
+        # Queued behind any pending create for the same alarm, so a stop or
+        # snooze right after the alarm starts never leaves it showing
+        alarm_manager.dismiss_notification(alarm_id)
+        return
+
+    await hass.services.async_call(
+        "persistent_notification",
+        "dismiss",
+        {"notification_id": f"alarm_{alarm_id}"},
+        blocking=False,
+    )
+
+
 class StopAlarmTool(llm.Tool):
     """Tool for stopping a ringing alarm."""
 
@@ -22,7 +73,7 @@ class StopAlarmTool(llm.Tool):
     Keep your response concise and friendly, in plain text without formatting.
     """
 
-    parameters = vol.Schema({})
+    parameters = vol.Schema({}, extra=vol.REMOVE_EXTRA)
 
     def wrap_response(self, response: dict) -> dict:
         response["instruction"] = self.response_instruction
@@ -39,20 +90,26 @@ class StopAlarmTool(llm.Tool):
 
         try:
             # Get ringing alarms from hass.data
-            ringing_alarms = hass.data.get(DOMAIN, {}).get("ringing_alarms", [])
+            domain_data = hass.data.setdefault(DOMAIN, {})
+            ringing_alarms = domain_data.get("ringing_alarms")
 
             if not ringing_alarms:
                 return {"error": "No alarm is currently ringing"}
 
-            # Stop all ringing alarms
-            count = 0
-            for alarm_id in ringing_alarms[:]:  # Copy list to modify during iteration
-                await self._stop_alarm(hass, alarm_id)
-                count += 1
+            # Snapshot and clear ringing alarms before stopping them
+            alarm_ids = list(ringing_alarms)
+            ringing_alarms.clear()
+            count = len(alarm_ids)
 
-            # Clear ringing alarms list
-            if DOMAIN in hass.data:
-                hass.data[DOMAIN]["ringing_alarms"] = []
+            # Stop the media player once and stop all ringing alarms concurrently
+            results = await asyncio.gather(
+                _stop_media(hass),
+                *(self._cancel_timer_and_dismiss(hass, alarm_id) for alarm_id in alarm_ids),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    _LOGGER.warning("Could not stop alarm: %s", result)
 
             return self.wrap_response(
                 {
@@ -66,41 +123,18 @@ class StopAlarmTool(llm.Tool):
             _LOGGER.error("Error stopping alarm: %s", e)
             return {"error": f"Failed to stop alarm: {e!s}"}
 
-    async def _stop_alarm(self, hass: HomeAssistant, alarm_id: int):
-        """Stop a specific alarm."""
+    async def _cancel_timer_and_dismiss(self, hass: HomeAssistant, alarm_id: int):
+        """Cancel the auto-dismiss timer and notification of a specific alarm."""
         # Cancel auto-dismiss timer if it exists
-        alarm_manager = hass.data.get(DOMAIN, {}).get("alarm_manager")
+        alarm_manager = hass.data[DOMAIN].get("alarm_manager")
         if alarm_manager and hasattr(alarm_manager, "_auto_dismiss_timers"):
             cancel_func = alarm_manager._auto_dismiss_timers.pop(alarm_id, None)
             if cancel_func:
                 cancel_func()
                 _LOGGER.debug("Cancelled auto-dismiss timer for alarm %d", alarm_id)
 
-        # Stop media player
-        config_data = hass.data.get(DOMAIN, {}).get("config", {})
-        media_player = config_data.get("media_player_entity")
-
-        if media_player:
-            try:
-                await hass.services.async_call(
-                    "media_player",
-                    "media_stop",
-                    {"entity_id": media_player},
-                    blocking=False,
-                )
-            except Exception as e:
-                _LOGGER.warning("Could not stop media player: %s", e)
-
         # Dismiss notification
-        try:
-            await hass.services.async_call(
-                "persistent_notification",
-                "dismiss",
-                {"notification_id": f"alarm_{alarm_id}"},
-                blocking=False,
-            )
-        except Exception as e:
-            _LOGGER.warning("Could not dismiss notification: %s", e)
+        await _dismiss_notification(hass, alarm_manager, alarm_id)
 
 
 class SnoozeAlarmTool(llm.Tool):
@@ -119,7 +153,8 @@ class SnoozeAlarmTool(llm.Tool):
                 "duration_minutes",
                 description="How many minutes to snooze for. Default is 9 minutes if not specified.",
             ): int,
-        }
+        },
+        extra=vol.REMOVE_EXTRA,
     )
 
     def wrap_response(self, response: dict) -> dict:
@@ -134,10 +169,11 @@ class SnoozeAlarmTool(llm.Tool):
     ) -> JsonObjectType:
         """Call the tool to snooze ringing alarm."""
         duration_minutes = tool_input.tool_args.get("duration_minutes")
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        config_data = domain_data.get("config", EMPTY_CONFIG)
 
         # Get snooze duration from config or use default
         if duration_minutes is None:
-            config_data = hass.data.get(DOMAIN, {}).get("config", {})
             duration_minutes = config_data.get(
                 CONF_SNOOZE_DURATION, DEFAULT_SNOOZE_DURATION
             )
@@ -146,79 +182,67 @@ class SnoozeAlarmTool(llm.Tool):
 
         try:
             # Get ringing alarms from hass.data
-            ringing_alarms = hass.data.get(DOMAIN, {}).get("ringing_alarms", [])
+            ringing_alarms = domain_data.get("ringing_alarms")
 
             if not ringing_alarms:
                 return {"error": "No alarm is currently ringing"}
+            ringing_ids = list(ringing_alarms)
 
             # Cancel auto-dismiss timers for all ringing alarms
-            alarm_manager = hass.data[DOMAIN].get("alarm_manager")
+            alarm_manager = domain_data.get("alarm_manager")
             if alarm_manager and hasattr(alarm_manager, "_auto_dismiss_timers"):
-                for alarm_id in ringing_alarms:
+                for alarm_id in ringing_ids:
                     cancel_func = alarm_manager._auto_dismiss_timers.pop(alarm_id, None)
                     if cancel_func:
                         cancel_func()
                         _LOGGER.debug("Cancelled auto-dismiss timer for alarm %d during snooze", alarm_id)
 
-            # Stop the sound
-            config_data = hass.data.get(DOMAIN, {}).get("config", {})
-            media_player = config_data.get("media_player_entity")
-
-            if media_player:
-                try:
-                    await hass.services.async_call(
-                        "media_player",
-                        "media_stop",
-                        {"entity_id": media_player},
-                        blocking=False,
-                    )
-                except Exception as e:
-                    _LOGGER.warning("Could not stop media player: %s", e)
-
-            # Schedule alarm to ring again after snooze duration
-            from homeassistant.helpers.event import async_call_later
-
-            count = 0
-
-            for alarm_id in ringing_alarms[:]:
-                # Get alarm details
-                from .alarm_storage import AlarmStorage
-                storage = AlarmStorage()
-                alarms = storage.get_all_alarms()
-                alarm = next((a for a in alarms if a["id"] == alarm_id), None)
-
-                if alarm:
-                    # Schedule snooze callback
-                    async def snooze_callback(now, aid=alarm_id):
-                        if alarm_manager:
-                            # Re-trigger the alarm
-                            await alarm_manager._trigger_alarm(
-                                {"id": aid, "name": f"Snoozed: {alarm['name']}",
-                                 "sound": alarm.get("sound", "default")}
-                            )
-
-                    async_call_later(
-                        hass, duration_minutes * 60, snooze_callback
-                    )
-                    count += 1
-
-            # Clear ringing alarms list and dismiss notifications
-            if DOMAIN in hass.data:
-                hass.data[DOMAIN]["ringing_alarms"] = []
-
-            for alarm_id in ringing_alarms:
-                try:
-                    await hass.services.async_call(
-                        "persistent_notification",
-                        "dismiss",
-                        {"notification_id": f"alarm_{alarm_id}"},
-                        blocking=False,
-                    )
-                except Exception as e:
-                    _LOGGER.warning("Could not dismiss notification: %s", e)
+            # Load alarm details once from the shared storage and index them by ID
+            storage = domain_data.get("storage")
+            if storage is None:
+                if alarm_manager:
+                    storage = alarm_manager.storage
+                else:
+                    storage = AlarmStorage()
+            alarms = await hass.async_add_executor_job(storage.get_all_alarms)
+            alarms_by_id = {a["id"]: a for a in alarms}
+
+            # Schedule a snooze callback for every ringing alarm that still exists
+            snooze_ids = [aid for aid in ringing_ids if aid in alarms_by_id]
+            snooze_seconds = duration_minutes * 60
+            for alarm_id in snooze_ids:
+                alarm = alarms_by_id[alarm_id]
+                async_call_later(
+                    hass,
+                    snooze_seconds,
+                    _make_snooze_callback(
+                        hass,
+                        alarm_manager,
+                        alarm_id,
+                        alarm["name"],
+                        alarm.get("sound", "default"),
+                    ),
+                )
+            count = len(snooze_ids)
+
+            # Clear ringing alarms
+            ringing_alarms.clear()
+
+            # Stop the sound and dismiss notifications in a single batch
+            results = await asyncio.gather(
+                _stop_media(hass),
+                *(
+                    _dismiss_notification(hass, alarm_manager, alarm_id)
+                    for alarm_id in ringing_ids
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    _LOGGER.warning("Could not stop alarm during snooze: %s", result)
 
             # Calculate when alarm will ring again
-            snooze_until = datetime.now() + timedelta(minutes=duration_minutes)
+            snooze_until = dt_util.now() + timedelta(minutes=duration_minutes)
             snooze_time = snooze_until.strftime("%H:%M")
 
             return self.wrap_response(
@@ -1,10 +1,12 @@
 """Alarm manager for scheduling and triggering alarms."""
 import asyncio
+import heapq
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import dt as dt_util
 
 from .alarm_storage import AlarmStorage
@@ -13,12 +15,59 @@ from .const import (
     CONF_ALARM_VOLUME,
     CONF_AUTO_DISMISS_DURATION,
     CONF_MEDIA_PLAYER,
+    CUSTOM_SOUND_FILE,
     DEFAULT_AUTO_DISMISS_DURATION,
     DOMAIN,
+    EMPTY_CONFIG,
+    SOUND_FILES,
 )
+from .playback import async_play_sound
 
 _LOGGER = logging.getLogger(__name__)
 
+# How long to collect persistent_notification calls before sending them
+_NOTIFICATION_BATCH_DELAY = 0.05  # seconds
+
+
+@lru_cache(maxsize=256)
+def _compute_next_trigger(
+    hour: int, minute: int, repeat_mask: int, now: datetime
+) -> datetime:
+    """Calculate the next trigger time for an alarm.
+
+    Alarm times have minute resolution, so callers pass `now` truncated to
+    the minute; alarms sharing a schedule then share one cache entry.
+    """
+    today = now.date()
+
+    # Create a datetime for today at the alarm time
+    alarm_time = dt_util.as_local(
+        datetime(today.year, today.month, today.day, hour, minute)
+    )
+
+    if repeat_mask:
+        # Repeating alarm - rotate the mask so bit 0 is today, then jump
+        # straight to the lowest set bit. Today is skipped if the alarm
+        # time has already passed; if that leaves nothing, it is a week out.
+        today_weekday = today.weekday()
+        days = (
+            (repeat_mask >> today_weekday) | (repeat_mask << (7 - today_weekday))
+        ) & 0x7F
+        if alarm_time <= now:
+            days &= ~1
+        days_ahead = (days & -days).bit_length() - 1 if days else 7
+        return alarm_time + timedelta(days=days_ahead)
+    else:
+        # One-time alarm
+        if alarm_time > now:
+            return alarm_time
+        else:
+            # If time has passed today, schedule for tomorrow
+            tomorrow = today + timedelta(days=1)
+            return dt_util.as_local(
+                datetime(tomorrow.year, tomorrow.month, tomorrow.day, hour, minute)
+            )
+
 
 class AlarmManager:
     """Manages alarm scheduling and triggering."""
@@ -27,10 +76,25 @@ class AlarmManager:
         """Initialize the alarm manager."""
         self.hass = hass
         self.storage = AlarmStorage()
-        self._scheduled_timers = {}
+        # Pending alarms are kept in one heap of (UTC timestamp, alarm ID) with
+        # a single HA timer armed for the earliest entry. Entries whose
+        # timestamp no longer matches _next_due are stale and skipped.
+        self._heap: list[tuple[float, int]] = []
+        self._next_due: dict[int, float] = {}
+        self._alarms_by_id: dict[int, dict] = {}
+        self._wakeup_cancel = None
+        self._wakeup_at: float | None = None
         self._auto_dismiss_timers = {}
+        self._notification_queue = {}
+        self._notification_flush_cancel = None
+        self._triggering: set[int] = set()
         self._running = False
 
+        # Shared with the stop/snooze tools, which clear it in place
+        self._ringing: set[int] = hass.data.setdefault(DOMAIN, {}).setdefault(
+            "ringing_alarms", set()
+        )
+
     async def start(self):
         """Start the alarm manager and schedule all alarms."""
         if self._running:
@@ -40,9 +104,10 @@ class AlarmManager:
         _LOGGER.info("Starting alarm manager")
 
         # Load and schedule all enabled alarms
-        alarms = self.storage.get_enabled_alarms()
+        alarms = await self.hass.async_add_executor_job(self.storage.get_enabled_alarms)
+        now = dt_util.now()
         for alarm in alarms:
-            await self._schedule_alarm(alarm)
+            self._schedule_alarm(alarm, now)
 
         _LOGGER.info("Alarm manager started with %d active alarms", len(alarms))
 
@@ -51,39 +116,64 @@ class AlarmManager:
         _LOGGER.info("Stopping alarm manager")
         self._running = False
 
-        # Cancel all scheduled timers
-        for timer_cancel in self._scheduled_timers.values():
-            timer_cancel()
-        self._scheduled_timers.clear()
+        # Cancel all scheduled alarms
+        self._clear_schedule()
 
-        # Cancel all auto-dismiss timers
+        # Cancel all auto-dismiss timers, and forget the alarms they were
+        # going to dismiss so they do not block triggers after a reload
+        self._ringing.difference_update(self._auto_dismiss_timers)
         for timer_cancel in self._auto_dismiss_timers.values():
             timer_cancel()
         self._auto_dismiss_timers.clear()
 
-    async def _schedule_alarm(self, alarm: dict):
-        """Schedule a single alarm."""
+        # Send any notification changes that are still queued
+        if self._notification_flush_cancel:
+            self._notification_flush_cancel()
+        await self._flush_notifications()
+
+    def _get_config(self):
+        """Return the current integration config with a single hass.data lookup."""
+        domain_data = self.hass.data.get(DOMAIN)
+        return (domain_data and domain_data.get("config")) or EMPTY_CONFIG
+
+    def _clear_schedule(self):
+        """Drop all scheduled alarms and cancel the wakeup timer."""
+        if self._wakeup_cancel:
+            self._wakeup_cancel()
+            self._wakeup_cancel = None
+        self._wakeup_at = None
+        self._heap.clear()
+        self._next_due.clear()
+        self._alarms_by_id.clear()
+
+    def _schedule_alarm(self, alarm: dict, now: datetime | None = None):
+        """Schedule a single alarm, optionally relative to a shared `now`."""
         alarm_id = alarm["id"]
-        time_str = alarm["time"]
-        repeat_days = alarm.get("repeat_days")
+
+        # Forget any previous schedule for this alarm; its heap entry goes stale
+        self._next_due.pop(alarm_id, None)
+        self._alarms_by_id.pop(alarm_id, None)
 
         try:
-            # Parse the alarm time
-            hour, minute = map(int, time_str.split(":"))
+            repeat_mask = alarm["_repeat_mask"]
+            if alarm.get("repeat_days") and not repeat_mask:
+                _LOGGER.warning("Alarm %d has no valid repeat days", alarm_id)
+                return
 
             # Calculate next trigger time
-            next_trigger = self._calculate_next_trigger(hour, minute, repeat_days)
+            next_trigger = self._calculate_next_trigger(
+                alarm["_hour"], alarm["_minute"], repeat_mask, now
+            )
 
             if next_trigger:
-                # Schedule the alarm
-                timer_cancel = async_track_point_in_time(
-                    self.hass,
-                    lambda now: self.hass.async_create_task(
-                        self._trigger_alarm(alarm)
-                    ),
-                    next_trigger,
-                )
-                self._scheduled_timers[alarm_id] = timer_cancel
+                # Key the heap by UTC timestamp so DST transitions between now
+                # and the trigger time are already accounted for.
+                due = dt_util.as_utc(next_trigger).timestamp()
+                self._next_due[alarm_id] = due
+                self._alarms_by_id[alarm_id] = alarm
+                heapq.heappush(self._heap, (due, alarm_id))
+                if self._wakeup_at is None or due < self._wakeup_at:
+                    self._arm_wakeup()
                 _LOGGER.info(
                     "Scheduled alarm %d (%s) for %s",
                     alarm_id,
@@ -94,97 +184,103 @@ class AlarmManager:
         except Exception as e:
             _LOGGER.error("Error scheduling alarm %d: %s", alarm_id, e)
 
+    def _arm_wakeup(self):
+        """Arm the single timer for the earliest pending alarm."""
+        if self._wakeup_cancel:
+            self._wakeup_cancel()
+            self._wakeup_cancel = None
+
+        # Discard stale entries at the top of the heap
+        heap = self._heap
+        while heap and self._next_due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+        if not heap:
+            self._wakeup_at = None
+            return
+
+        self._wakeup_at = heap[0][0]
+        delay = self._wakeup_at - dt_util.utcnow().timestamp()
+        self._wakeup_cancel = async_call_later(self.hass, max(delay, 0), self._fire)
+
+    @callback
+    def _fire(self, now):
+        """Trigger every alarm that is due and re-arm for the next one."""
+        self._wakeup_cancel = None
+        self._wakeup_at = None
+        cutoff = dt_util.utcnow().timestamp()
+        heap = self._heap
+        while heap and heap[0][0] <= cutoff:
+            due, alarm_id = heapq.heappop(heap)
+            if self._next_due.get(alarm_id) != due:
+                continue
+            del self._next_due[alarm_id]
+            alarm = self._alarms_by_id.pop(alarm_id)
+            self.hass.async_create_task(self._trigger_alarm(alarm), eager_start=True)
+        self._arm_wakeup()
+
     def _calculate_next_trigger(
-        self, hour: int, minute: int, repeat_days: list[str] | None
+        self, hour: int, minute: int, repeat_mask: int, now: datetime | None = None
     ) -> datetime | None:
         """Calculate the next trigger time for an alarm."""
-        now = dt_util.now()
-        today = now.date()
-
-        # Create a datetime for today at the alarm time
-        alarm_time = datetime.combine(today, datetime.min.time().replace(hour=hour, minute=minute))
-        alarm_time = dt_util.as_local(alarm_time)
-
-        if repeat_days:
-            # Repeating alarm - find next occurrence
-            day_map = {
-                "mon": 0,
-                "tue": 1,
-                "wed": 2,
-                "thu": 3,
-                "fri": 4,
-                "sat": 5,
-                "sun": 6,
-            }
-            target_days = [day_map[day.lower()] for day in repeat_days if day.lower() in day_map]
-
-            if not target_days:
-                return None
-
-            # Find the next day that matches
-            for days_ahead in range(8):  # Check up to 7 days ahead + today
-                check_date = today + timedelta(days=days_ahead)
-                check_time = datetime.combine(
-                    check_date, datetime.min.time().replace(hour=hour, minute=minute)
-                )
-                check_time = dt_util.as_local(check_time)
-
-                if check_date.weekday() in target_days and check_time > now:
-                    return check_time
-
-            return None
-        else:
-            # One-time alarm
-            if alarm_time > now:
-                return alarm_time
-            else:
-                # If time has passed today, schedule for tomorrow
-                tomorrow = today + timedelta(days=1)
-                alarm_time = datetime.combine(
-                    tomorrow, datetime.min.time().replace(hour=hour, minute=minute)
-                )
-                return dt_util.as_local(alarm_time)
+        if now is None:
+            now = dt_util.now()
+        return _compute_next_trigger(
+            hour, minute, repeat_mask, now.replace(second=0, microsecond=0)
+        )
 
     async def _trigger_alarm(self, alarm: dict):
         """Trigger an alarm (play sound, send notification, etc.)."""
         alarm_id = alarm["id"]
         alarm_name = alarm["name"]
         alarm_sound = alarm.get("sound", "default")
+        ringing_alarms = self._ringing
+
+        # Ignore duplicate fires of an alarm that is already being triggered or
+        # still ringing. The check and the add below run without an await in
+        # between, so they cannot interleave with another trigger.
+        if alarm_id in self._triggering or alarm_id in ringing_alarms:
+            _LOGGER.debug("Alarm %d is already ringing, ignoring trigger", alarm_id)
+            # _fire already took the alarm off the schedule, so a repeating
+            # alarm still needs its next occurrence
+            if alarm.get("repeat_days"):
+                self._schedule_alarm(alarm)
+            return
 
         _LOGGER.info("Triggering alarm %d: %s", alarm_id, alarm_name)
+        self._triggering.add(alarm_id)
 
         try:
             # Track ringing alarm
-            if DOMAIN not in self.hass.data:
-                self.hass.data[DOMAIN] = {}
-            if "ringing_alarms" not in self.hass.data[DOMAIN]:
-                self.hass.data[DOMAIN]["ringing_alarms"] = []
-
-            self.hass.data[DOMAIN]["ringing_alarms"].append(alarm_id)
+            ringing_alarms.add(alarm_id)
 
             # Play alarm sound
-            await self._play_alarm_sound(alarm_sound)
+            await self._play_alarm_sound(alarm_sound, alarm.get("_sound_file"))
 
             # Send notification (optional)
-            await self._send_notification(alarm_name, alarm_id)
+            self._send_notification(alarm_name, alarm_id)
 
             # Schedule auto-dismiss after configured duration
             await self._schedule_auto_dismiss(alarm_id)
 
             # If it's a one-time alarm, disable it
             if not alarm.get("repeat_days"):
-                self.storage.toggle_alarm(alarm_id, False)
+                await self.hass.async_add_executor_job(
+                    self.storage.toggle_alarm, alarm_id, False
+                )
                 _LOGGER.info("Disabled one-time alarm %d", alarm_id)
             else:
                 # Reschedule repeating alarm for next occurrence
-                await self._schedule_alarm(alarm)
+                self._schedule_alarm(alarm)
 
         except Exception as e:
             _LOGGER.error("Error triggering alarm %d: %s", alarm_id, e)
+        finally:
+            self._triggering.discard(alarm_id)
 
-    async def _play_alarm_sound(self, sound: str):
-        """Play the alarm sound using a media player."""
-        config_data = self.hass.data.get(DOMAIN, {}).get("config", {})
+    async def _play_alarm_sound(self, sound: str, sound_file: str | None = None):
+        """Play the alarm sound, using the pre-resolved file when available."""
+        config_data = self._get_config()
         media_player = config_data.get(CONF_MEDIA_PLAYER)
         volume = config_data.get(CONF_ALARM_VOLUME, 0.5)
 
@@ -193,129 +289,143 @@ class AlarmManager:
             return
 
         try:
-            # Get custom file path if sound is "custom"
-            if sound == "custom":
-                custom_path = config_data.get("custom_sound_path")
-                if custom_path:
-                    sound_file = custom_path
+            # Resolve the file here only for the custom sound, whose path comes
+            # from the current config, or for alarms built without one
+            if sound_file is None:
+                if sound == "custom":
+                    sound_file = config_data.get("custom_sound_path") or CUSTOM_SOUND_FILE
                 else:
-                    sound_file = "/local/alarm_sounds/custom.mp3"
-            else:
-                # Map sound names to file paths or URLs
-                sound_map = {
-                    "default": "/local/alarm_sounds/default.mp3",
-                    "gentle": "/local/alarm_sounds/gentle.mp3",
-                    "beep": "/local/alarm_sounds/beep.mp3",
-                    "chime": "/local/alarm_sounds/chime.mp3",
-                    "bell": "/local/alarm_sounds/bell.mp3",
-                }
-                sound_file = sound_map.get(sound, sound_map["default"])
-
-            # Set volume
-            await self.hass.services.async_call(
-                "media_player",
-                "volume_set",
-                {"entity_id": media_player, "volume_level": volume},
-                blocking=True,
-            )
+                    sound_file = SOUND_FILES.get(sound, SOUND_FILES["default"])
 
-            # Play sound
-            await self.hass.services.async_call(
-                "media_player",
-                "play_media",
-                {
-                    "entity_id": media_player,
-                    "media_content_id": sound_file,
-                    "media_content_type": "music",
-                },
-                blocking=False,
-            )
+            await async_play_sound(self.hass, media_player, sound_file, volume)
 
             _LOGGER.info("Playing alarm sound: %s on %s", sound, media_player)
 
         except Exception as e:
             _LOGGER.error("Error playing alarm sound: %s", e)
 
-    async def _send_notification(self, alarm_name: str, alarm_id: int):
+    def _send_notification(self, alarm_name: str, alarm_id: int):
         """Send a notification for the alarm."""
-        try:
-            await self.hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {
-                    "title": "Alarm",
-                    "message": f"Alarm '{alarm_name}' is ringing!",
-                    "notification_id": f"alarm_{alarm_id}",
-                },
-                blocking=False,
+        self._queue_notification(
+            "create",
+            {
+                "title": "Alarm",
+                "message": f"Alarm '{alarm_name}' is ringing!",
+                "notification_id": f"alarm_{alarm_id}",
+            },
+        )
+
+    def dismiss_notification(self, alarm_id: int):
+        """Dismiss the notification for the alarm in the next batch."""
+        self._queue_notification("dismiss", {"notification_id": f"alarm_{alarm_id}"})
+
+    def _queue_notification(self, service: str, service_data: dict):
+        """Queue a persistent_notification call for the next batch.
+
+        Only the latest call per notification ID is kept, so a create followed
+        by a dismiss within the same batch only sends the dismiss.
+        """
+        notification_id = service_data["notification_id"]
+        self._notification_queue.pop(notification_id, None)
+        self._notification_queue[notification_id] = (service, service_data)
+
+        if self._notification_flush_cancel is None:
+            self._notification_flush_cancel = async_call_later(
+                self.hass, _NOTIFICATION_BATCH_DELAY, self._flush_notifications
             )
-        except Exception as e:
-            _LOGGER.error("Error sending alarm notification: %s", e)
+
+    async def _flush_notifications(self, now=None):
+        """Send all queued persistent_notification calls at once."""
+        self._notification_flush_cancel = None
+        if not self._notification_queue:
+            return
+
+        pending = list(self._notification_queue.values())
+        self._notification_queue.clear()
+
+        results = await asyncio.gather(
+            *(
+                self.hass.services.async_call(
+                    "persistent_notification", service, service_data, blocking=False
+                )
+                for service, service_data in pending
+            ),
+            return_exceptions=True,
+        )
+        for (service, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("Error sending %s alarm notification: %s", service, result)
 
     async def _schedule_auto_dismiss(self, alarm_id: int):
         """Schedule automatic dismissal of a ringing alarm."""
-        from homeassistant.helpers.event import async_call_later
-
         # Get auto-dismiss duration from config or use default
-        config_data = self.hass.data.get(DOMAIN, {}).get("config", {})
+        config_data = self._get_config()
         auto_dismiss_minutes = config_data.get(
             CONF_AUTO_DISMISS_DURATION, DEFAULT_AUTO_DISMISS_DURATION
         )
 
-        async def auto_dismiss_callback(now):
-            """Callback to automatically dismiss the alarm."""
-            _LOGGER.info("Auto-dismissing alarm %d after %d minutes", alarm_id, auto_dismiss_minutes)
-
-            # Remove from ringing alarms list
-            if DOMAIN in self.hass.data:
-                ringing_alarms = self.hass.data[DOMAIN].get("ringing_alarms", [])
-                if alarm_id in ringing_alarms:
-                    ringing_alarms.remove(alarm_id)
-
-            # Stop media player
-            media_player = config_data.get(CONF_MEDIA_PLAYER)
-            if media_player:
-                try:
-                    await self.hass.services.async_call(
-                        "media_player",
-                        "media_stop",
-                        {"entity_id": media_player},
-                        blocking=False,
-                    )
-                except Exception as e:
-                    _LOGGER.warning("Could not stop media player during auto-dismiss: %s", e)
-
-            # Dismiss notification
+        # Cancel any previous auto-dismiss for this alarm so it is not leaked
+        previous_cancel = self._auto_dismiss_timers.pop(alarm_id, None)
+        if previous_cancel:
+            previous_cancel()
+
+        # Schedule the auto-dismiss
+        cancel_timer = async_call_later(
+            self.hass,
+            auto_dismiss_minutes * 60,
+            partial(self._auto_dismiss, alarm_id, auto_dismiss_minutes),
+        )
+        self._auto_dismiss_timers[alarm_id] = cancel_timer
+        _LOGGER.info("Scheduled auto-dismiss for alarm %d in %d minutes", alarm_id, auto_dismiss_minutes)
+
+    async def _auto_dismiss(self, alarm_id: int, auto_dismiss_minutes: int, now=None):
+        """Automatically dismiss a ringing alarm."""
+        _LOGGER.info("Auto-dismissing alarm %d after %d minutes", alarm_id, auto_dismiss_minutes)
+
+        # Remove the timer from tracking
+        self._auto_dismiss_timers.pop(alarm_id, None)
+
+        # Remove from ringing alarms
+        self._ringing.discard(alarm_id)
+
+        # Dismiss notification
+        self.dismiss_notification(alarm_id)
+
+        # Stop media player, using the config that is current now rather than
+        # when the alarm started ringing
+        media_player = self._get_config().get(CONF_MEDIA_PLAYER)
+        if media_player:
             try:
                 await self.hass.services.async_call(
-                    "persistent_notification",
-                    "dismiss",
-                    {"notification_id": f"alarm_{alarm_id}"},
+                    "media_player",
+                    "media_stop",
+                    {"entity_id": media_player},
                     blocking=False,
                 )
             except Exception as e:
-                _LOGGER.warning("Could not dismiss notification during auto-dismiss: %s", e)
+                _LOGGER.warning("Could not stop media player during auto-dismiss: %s", e)
 
-            # Remove the timer from tracking
-            self._auto_dismiss_timers.pop(alarm_id, None)
+    def cancel_alarm(self, alarm_id: int):
+        """Remove a single alarm from the schedule (e.g. after deleting it)."""
+        due = self._next_due.pop(alarm_id, None)
+        self._alarms_by_id.pop(alarm_id, None)
+        if due is not None and due == self._wakeup_at:
+            # The wakeup timer was armed for this alarm; move it to the next one
+            self._arm_wakeup()
 
-        # Schedule the auto-dismiss
-        cancel_timer = async_call_later(
-            self.hass, auto_dismiss_minutes * 60, auto_dismiss_callback
-        )
-        self._auto_dismiss_timers[alarm_id] = cancel_timer
-        _LOGGER.info("Scheduled auto-dismiss for alarm %d in %d minutes", alarm_id, auto_dismiss_minutes)
+    def cancel_all_alarms(self):
+        """Remove every alarm from the schedule (e.g. after deleting all)."""
+        self._clear_schedule()
 
     async def reschedule_all(self):
         """Reschedule all alarms (useful after configuration changes)."""
         _LOGGER.info("Rescheduling all alarms")
 
-        # Cancel existing timers
-        for timer_cancel in self._scheduled_timers.values():
-            timer_cancel()
-        self._scheduled_timers.clear()
+        # Cancel existing schedule
+        self._clear_schedule()
 
         # Reload and reschedule
-        alarms = self.storage.get_enabled_alarms()
+        alarms = await self.hass.async_add_executor_job(self.storage.get_enabled_alarms)
+        now = dt_util.now()
         for alarm in alarms:
-            await self._schedule_alarm(alarm)
+            self._schedule_alarm(alarm, now)
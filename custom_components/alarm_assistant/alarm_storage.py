@@ -3,17 +3,78 @@ import json
 import logging
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Any
 
+from .const import DAY_MAP, SOUND_FILES
+
 logger = logging.getLogger(__name__)
 
+def parse_schedule(time_str: str, repeat_days: list[str] | None) -> tuple[int, int, int]:
+    """
+    Parse an alarm's time and repeat days.
+
+    Args:
+        time_str: Time in HH:MM format
+        repeat_days: List of days (mon, tue, wed, thu, fri, sat, sun) or None
+
+    Returns:
+        Tuple of (hour, minute, repeat_mask) where bit 0 of the mask is Monday
+    """
+    hour, minute = map(int, time_str.split(":"))
+    repeat_mask = 0
+    for day in repeat_days or ():
+        weekday = DAY_MAP.get(day.lower())
+        if weekday is not None:
+            repeat_mask |= 1 << weekday
+    return hour, minute, repeat_mask
+
+
+def resolve_sound_file(sound: str | None) -> str | None:
+    """
+    Resolve a sound name to the media file it plays.
+
+    Returns None for the custom sound, whose path comes from the current
+    config and is looked up when the alarm plays.
+    """
+    if sound == "custom":
+        return None
+    return SOUND_FILES.get(sound, SOUND_FILES["default"])
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class AlarmStorage:
-    """Singleton class for managing alarm storage in SQLite."""
+    """Singleton class for managing alarm storage in SQLite.
+
+    Methods are blocking and are meant to be run in the executor. Access to
+    the shared connection is serialized with a lock.
+    """
 
     _instance = None
 
+    # SQL statements are kept as constants so every call passes the same string
+    # object and hits sqlite3's prepared statement cache
+    _SQL_COLUMNS = "id, name, time, enabled, repeat_days, sound, created_at"
+    _SQL_INSERT = (
+        "INSERT INTO alarms (name, time, enabled, repeat_days, sound, created_at) "
+        "VALUES (?, ?, 1, ?, ?, ?)"
+    )
+    _SQL_SELECT_ALL = f"SELECT {_SQL_COLUMNS} FROM alarms ORDER BY time"
+    _SQL_SELECT_ENABLED = (
+        f"SELECT {_SQL_COLUMNS} FROM alarms WHERE enabled = 1 ORDER BY time"
+    )
+    _SQL_DELETE_BY_ID = "DELETE FROM alarms WHERE id = ?"
+    _SQL_SELECT_IDS_BY_NAME = "SELECT id FROM alarms WHERE name LIKE ? ESCAPE '\\'"
+    _SQL_DELETE_BY_NAME = "DELETE FROM alarms WHERE name LIKE ? ESCAPE '\\'"
+    _SQL_DELETE_ALL = "DELETE FROM alarms"
+    _SQL_UPDATE_ENABLED = "UPDATE alarms SET enabled = ? WHERE id = ?"
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -26,21 +87,73 @@ class AlarmStorage:
         db_path = os.path.join(base_dir, "alarms.db")
         os.makedirs(base_dir, exist_ok=True)
 
-        self._conn = sqlite3.connect(db_path, check_same_thread=False)
-        self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS alarms (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                time TEXT NOT NULL,
-                enabled INTEGER NOT NULL DEFAULT 1,
-                repeat_days TEXT,
-                sound TEXT,
-                created_at INTEGER NOT NULL
+        self._lock = threading.Lock()
+
+        # Autocommit mode: single statements commit on their own and
+        # multi-statement work is wrapped in explicit BEGIN/COMMIT
+        self._conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=128,
+        )
+        # WAL with synchronous=NORMAL needs one fsync per commit at most and
+        # lets readers run alongside the single writer
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=67108864")
+
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS alarms (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    enabled INTEGER NOT NULL DEFAULT 1,
+                    repeat_days TEXT,
+                    sound TEXT,
+                    created_at INTEGER NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_alarms_enabled ON alarms(enabled) WHERE enabled = 1"
             )
-        """)
-        self._conn.commit()
+            self._migrate_repeat_days()
         logger.info("Alarm database initialized at %s", db_path)
 
+    @contextmanager
+    def _transaction(self):
+        """Hold the lock and run the enclosed statements in a single transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _migrate_repeat_days(self):
+        """Rewrite repeat_days stored as JSON lists into comma-separated strings."""
+        rows = self._conn.execute(
+            "SELECT id, repeat_days FROM alarms WHERE repeat_days LIKE '[%'"
+        ).fetchall()
+        migrated = 0
+        for alarm_id, repeat_days_json in rows:
+            try:
+                repeat_days = json.loads(repeat_days_json)
+                value = ",".join(repeat_days) if repeat_days else None
+            except (ValueError, TypeError) as e:
+                logger.error("Skipping repeat days migration of alarm %d: %s", alarm_id, e)
+                continue
+            self._conn.execute(
+                "UPDATE alarms SET repeat_days = ? WHERE id = ?", (value, alarm_id)
+            )
+            migrated += 1
+        if migrated:
+            logger.info("Migrated repeat days of %d alarm(s) to comma-separated format", migrated)
+
     def add_alarm(
         self,
         name: str,
@@ -61,48 +174,107 @@ class AlarmStorage:
             The ID of the created alarm
         """
         created_at = int(datetime.now().timestamp())
-        repeat_days_json = json.dumps(repeat_days) if repeat_days else None
-
-        cursor = self._conn.execute(
-            """
-            INSERT INTO alarms (name, time, enabled, repeat_days, sound, created_at)
-            VALUES (?, ?, 1, ?, ?, ?)
-            """,
-            (name, time, repeat_days_json, sound, created_at),
-        )
-        self._conn.commit()
+        repeat_days_csv = ",".join(repeat_days) if repeat_days else None
+
+        with self._lock:
+            cursor = self._conn.execute(
+                self._SQL_INSERT, (name, time, repeat_days_csv, sound, created_at)
+            )
         alarm_id = cursor.lastrowid
         logger.info("Created alarm: %s at %s (ID: %d)", name, time, alarm_id)
         return alarm_id
 
-    def get_all_alarms(self) -> list[dict[str, Any]]:
-        """Get all alarms."""
-        cursor = self._conn.execute(
-            """
-            SELECT id, name, time, enabled, repeat_days, sound, created_at
-            FROM alarms
-            ORDER BY time
-            """
-        )
-        alarms = []
-        for row in cursor.fetchall():
-            repeat_days = json.loads(row[4]) if row[4] else None
-            alarms.append(
-                {
-                    "id": row[0],
-                    "name": row[1],
-                    "time": row[2],
-                    "enabled": bool(row[3]),
-                    "repeat_days": repeat_days,
-                    "sound": row[5],
-                    "created_at": row[6],
-                }
+    def add_alarms(self, alarms: list[dict[str, Any]]) -> int:
+        """
+        Add several alarms in a single transaction.
+
+        Args:
+            alarms: Dicts with name, time and optionally repeat_days and sound
+
+        Returns:
+            Number of alarms created
+        """
+        created_at = int(datetime.now().timestamp())
+        rows = [
+            (
+                alarm["name"],
+                alarm["time"],
+                ",".join(alarm["repeat_days"]) if alarm.get("repeat_days") else None,
+                alarm.get("sound", "default"),
+                created_at,
             )
+            for alarm in alarms
+        ]
+
+        with self._transaction() as conn:
+            conn.executemany(self._SQL_INSERT, rows)
+        logger.info("Created %d alarm(s)", len(rows))
+        return len(rows)
+
+    @staticmethod
+    def _row_to_dict(row: tuple) -> dict[str, Any]:
+        """Convert an alarms table row into an alarm dict."""
+        repeat_days = row[4].split(",") if row[4] else None
+        hour, minute, repeat_mask = parse_schedule(row[2], repeat_days)
+        return {
+            "id": row[0],
+            "name": row[1],
+            "time": row[2],
+            "enabled": bool(row[3]),
+            "repeat_days": repeat_days,
+            "sound": row[5],
+            "created_at": row[6],
+            "_hour": hour,
+            "_minute": minute,
+            "_repeat_mask": repeat_mask,
+            "_sound_file": resolve_sound_file(row[5]),
+        }
+
+    @classmethod
+    def _rows_to_dicts(cls, rows: list[tuple]) -> list[dict[str, Any]]:
+        """Convert alarms table rows into alarm dicts, skipping malformed ones."""
+        alarms = []
+        for row in rows:
+            try:
+                alarms.append(cls._row_to_dict(row))
+            except ValueError as e:
+                logger.error("Skipping malformed alarm %d: %s", row[0], e)
         return alarms
 
+    def get_all_alarms(self) -> list[dict[str, Any]]:
+        """Get all alarms."""
+        with self._lock:
+            rows = self._conn.execute(self._SQL_SELECT_ALL).fetchall()
+        return self._rows_to_dicts(rows)
+
+    def get_alarm_summaries(self) -> list[dict[str, Any]]:
+        """Get all alarms in the shape presented to the user.
+
+        Empty repeat days and sound are left out and no schedule fields are
+        added.
+        """
+        with self._lock:
+            rows = self._conn.execute(self._SQL_SELECT_ALL).fetchall()
+        summaries = []
+        for row in rows:
+            summary = {
+                "id": row[0],
+                "name": row[1],
+                "time": row[2],
+                "enabled": bool(row[3]),
+            }
+            if row[4]:
+                summary["repeat_days"] = row[4].split(",")
+            if row[5]:
+                summary["sound"] = row[5]
+            summaries.append(summary)
+        return summaries
+
     def get_enabled_alarms(self) -> list[dict[str, Any]]:
         """Get only enabled alarms."""
-        return [alarm for alarm in self.get_all_alarms() if alarm["enabled"]]
+        with self._lock:
+            rows = self._conn.execute(self._SQL_SELECT_ENABLED).fetchall()
+        return self._rows_to_dicts(rows)
 
     def delete_alarm(self, alarm_id: int) -> bool:
         """
@@ -114,8 +286,8 @@ class AlarmStorage:
         Returns:
             True if alarm was deleted, False if not found
         """
-        cursor = self._conn.execute("DELETE FROM alarms WHERE id = ?", (alarm_id,))
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute(self._SQL_DELETE_BY_ID, (alarm_id,))
         deleted = cursor.rowcount > 0
         if deleted:
             logger.info("Deleted alarm with ID: %d", alarm_id)
@@ -123,7 +295,7 @@ class AlarmStorage:
             logger.warning("Alarm with ID %d not found", alarm_id)
         return deleted
 
-    def delete_alarm_by_name(self, name: str) -> int:
+    def delete_alarm_by_name(self, name: str) -> list[int]:
         """
         Delete alarm(s) by name.
 
@@ -131,15 +303,16 @@ class AlarmStorage:
             name: The name of the alarm(s) to delete
 
         Returns:
-            Number of alarms deleted
+            IDs of the deleted alarms
         """
-        cursor = self._conn.execute(
-            "DELETE FROM alarms WHERE name LIKE ?", (f"%{name}%",)
-        )
-        self._conn.commit()
-        count = cursor.rowcount
-        logger.info("Deleted %d alarm(s) matching name: %s", count, name)
-        return count
+        pattern = (f"%{_escape_like(name)}%",)
+        with self._transaction() as conn:
+            alarm_ids = [
+                row[0] for row in conn.execute(self._SQL_SELECT_IDS_BY_NAME, pattern)
+            ]
+            conn.execute(self._SQL_DELETE_BY_NAME, pattern)
+        logger.info("Deleted %d alarm(s) matching name: %s", len(alarm_ids), name)
+        return alarm_ids
 
     def delete_all_alarms(self) -> int:
         """
@@ -148,8 +321,8 @@ class AlarmStorage:
         Returns:
             Number of alarms deleted
         """
-        cursor = self._conn.execute("DELETE FROM alarms")
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute(self._SQL_DELETE_ALL)
         count = cursor.rowcount
         logger.info("Deleted all alarms (%d total)", count)
         return count
@@ -165,11 +338,10 @@ class AlarmStorage:
         Returns:
             True if alarm was updated, False if not found
         """
-        cursor = self._conn.execute(
-            "UPDATE alarms SET enabled = ? WHERE id = ?",
-            (1 if enabled else 0, alarm_id),
-        )
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute(
+                self._SQL_UPDATE_ENABLED, (1 if enabled else 0, alarm_id)
+            )
         updated = cursor.rowcount > 0
         if updated:
             logger.info("Alarm %d %s", alarm_id, "enabled" if enabled else "disabled")
@@ -1,18 +1,26 @@
 """LLM Tools for alarm management."""
 import logging
-import re
 from datetime import datetime
+from functools import partial
 
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import llm
 from homeassistant.util.json import JsonObjectType
 
-from .alarm_storage import AlarmStorage
-from .const import DOMAIN
+from .alarm_storage import AlarmStorage, parse_schedule, resolve_sound_file
+from .const import DAY_MAP, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
+_VALID_DAYS = frozenset(DAY_MAP)
+
+
+def _get_alarm_manager(hass: HomeAssistant):
+    """Return the alarm manager without building a default dict per call."""
+    domain_data = hass.data.get(DOMAIN)
+    return domain_data and domain_data.get("alarm_manager")
+
 
 class SetAlarmTool(llm.Tool):
     """Tool for setting an alarm."""
@@ -42,7 +50,8 @@ class SetAlarmTool(llm.Tool):
                 "sound",
                 description="Optional alarm sound. Options: default, gentle, beep, chime, bell",
             ): str,
-        }
+        },
+        extra=vol.REMOVE_EXTRA,
     )
 
     def wrap_response(self, response: dict) -> dict:
@@ -51,22 +60,29 @@ class SetAlarmTool(llm.Tool):
 
     def _validate_time(self, time_str: str) -> tuple[bool, str]:
         """Validate time format and return (is_valid, error_message)."""
-        pattern = r"^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$"
-        if not re.match(pattern, time_str):
-            return False, "Time must be in HH:MM format (24-hour). Example: 07:30 or 14:00"
-        return True, ""
+        hour, sep, minute = time_str.partition(":")
+        if (
+            sep
+            and 1 <= len(hour) <= 2
+            and len(minute) == 2
+            and (hour + minute).isascii()
+            and (hour + minute).isdigit()
+            and int(hour) <= 23
+            and int(minute) <= 59
+        ):
+            return True, ""
+        return False, "Time must be in HH:MM format (24-hour). Example: 07:30 or 14:00"
 
     def _validate_repeat_days(self, days: list[str] | None) -> tuple[bool, str]:
         """Validate repeat days."""
         if not days:
             return True, ""
-        valid_days = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-        for day in days:
-            if day.lower() not in valid_days:
-                return (
-                    False,
-                    f"Invalid day: {day}. Use: mon, tue, wed, thu, fri, sat, sun",
-                )
+        invalid_days = {day.lower() for day in days} - _VALID_DAYS
+        if invalid_days:
+            return (
+                False,
+                f"Invalid day: {', '.join(sorted(invalid_days))}. Use: mon, tue, wed, thu, fri, sat, sun",
+            )
         return True, ""
 
     async def async_call(
@@ -95,12 +111,18 @@ class SetAlarmTool(llm.Tool):
 
         try:
             storage = AlarmStorage()
-            alarm_id = storage.add_alarm(
-                name=name, time=time_str, repeat_days=repeat_days, sound=sound
+            alarm_id = await hass.async_add_executor_job(
+                partial(
+                    storage.add_alarm,
+                    name=name,
+                    time=time_str,
+                    repeat_days=repeat_days,
+                    sound=sound,
+                )
             )
 
             # Schedule the alarm
-            await self._schedule_alarm(hass, alarm_id, time_str, repeat_days)
+            self._schedule_alarm(hass, alarm_id, name, time_str, repeat_days, sound)
 
             response = {
                 "success": True,
@@ -117,25 +139,35 @@ class SetAlarmTool(llm.Tool):
             _LOGGER.error("Error setting alarm: %s", e)
             return {"error": f"Failed to set alarm: {e!s}"}
 
-    async def _schedule_alarm(
+    def _schedule_alarm(
         self,
         hass: HomeAssistant,
         alarm_id: int,
+        name: str,
         time_str: str,
         repeat_days: list[str] | None,
+        sound: str,
     ):
         """Schedule the alarm in Home Assistant."""
         # Get the alarm manager and schedule the alarm
-        alarm_manager = hass.data.get(DOMAIN, {}).get("alarm_manager")
+        alarm_manager = _get_alarm_manager(hass)
         if alarm_manager:
-            # Get the full alarm details from storage
-            storage = AlarmStorage()
-            alarms = storage.get_all_alarms()
-            alarm = next((a for a in alarms if a["id"] == alarm_id), None)
-
-            if alarm:
-                await alarm_manager._schedule_alarm(alarm)
-                _LOGGER.info("Alarm %d scheduled through AlarmManager", alarm_id)
+            # Build the alarm from the values just stored instead of reading it back
+            hour, minute, repeat_mask = parse_schedule(time_str, repeat_days)
+            alarm = {
+                "id": alarm_id,
+                "name": name,
+                "time": time_str,
+                "enabled": True,
+                "repeat_days": repeat_days or None,
+                "sound": sound,
+                "_hour": hour,
+                "_minute": minute,
+                "_repeat_mask": repeat_mask,
+                "_sound_file": resolve_sound_file(sound),
+            }
+            alarm_manager._schedule_alarm(alarm)
+            _LOGGER.info("Alarm %d scheduled through AlarmManager", alarm_id)
         else:
             _LOGGER.warning("AlarmManager not found, alarm %d not scheduled", alarm_id)
 
@@ -152,7 +184,7 @@ class ListAlarmsTool(llm.Tool):
     Keep your response concise and in plain text without formatting.
     """
 
-    parameters = vol.Schema({})
+    parameters = vol.Schema({}, extra=vol.REMOVE_EXTRA)
 
     def wrap_response(self, response: dict) -> dict:
         response["instruction"] = self.response_instruction
@@ -169,30 +201,16 @@ class ListAlarmsTool(llm.Tool):
 
         try:
             storage = AlarmStorage()
-            alarms = storage.get_all_alarms()
+            alarms = await hass.async_add_executor_job(storage.get_alarm_summaries)
 
             if not alarms:
                 return self.wrap_response(
                     {"alarms": [], "message": "No alarms are currently set"}
                 )
 
-            alarm_list = []
-            for alarm in alarms:
-                alarm_info = {
-                    "id": alarm["id"],
-                    "name": alarm["name"],
-                    "time": alarm["time"],
-                    "enabled": alarm["enabled"],
-                }
-                if alarm["repeat_days"]:
-                    alarm_info["repeat_days"] = alarm["repeat_days"]
-                if alarm["sound"]:
-                    alarm_info["sound"] = alarm["sound"]
-                alarm_list.append(alarm_info)
-
             return self.wrap_response(
                 {
-                    "alarms": alarm_list,
+                    "alarms": alarms,
                     "count": len(alarms),
                     "message": f"You have {len(alarms)} alarm{'s' if len(alarms) != 1 else ''} set",
                 }
@@ -227,7 +245,8 @@ class DeleteAlarmTool(llm.Tool):
                 "delete_all",
                 description="Set to true to delete all alarms. Use when user says 'delete all alarms' or 'clear all alarms'.",
             ): bool,
-        }
+        },
+        extra=vol.REMOVE_EXTRA,
     )
 
     def wrap_response(self, response: dict) -> dict:
@@ -253,11 +272,11 @@ class DeleteAlarmTool(llm.Tool):
             storage = AlarmStorage()
 
             if delete_all:
-                count = storage.delete_all_alarms()
-                # Reschedule all alarms in alarm manager (clears old ones)
-                alarm_manager = hass.data.get(DOMAIN, {}).get("alarm_manager")
+                count = await hass.async_add_executor_job(storage.delete_all_alarms)
+                # Drop all scheduled alarms in alarm manager
+                alarm_manager = _get_alarm_manager(hass)
                 if alarm_manager:
-                    await alarm_manager.reschedule_all()
+                    alarm_manager.cancel_all_alarms()
                 return self.wrap_response(
                     {
                         "success": True,
@@ -267,12 +286,14 @@ class DeleteAlarmTool(llm.Tool):
                 )
 
             if alarm_id is not None:
-                success = storage.delete_alarm(alarm_id)
+                success = await hass.async_add_executor_job(
+                    storage.delete_alarm, alarm_id
+                )
                 if success:
-                    # Reschedule all alarms in alarm manager (removes deleted ones)
-                    alarm_manager = hass.data.get(DOMAIN, {}).get("alarm_manager")
+                    # Unschedule the deleted alarm in alarm manager
+                    alarm_manager = _get_alarm_manager(hass)
                     if alarm_manager:
-                        await alarm_manager.reschedule_all()
+                        alarm_manager.cancel_alarm(alarm_id)
                     return self.wrap_response(
                         {
                             "success": True,
@@ -283,8 +304,16 @@ class DeleteAlarmTool(llm.Tool):
                 return {"error": f"Alarm with ID {alarm_id} not found"}
 
             if name:
-                count = storage.delete_alarm_by_name(name)
+                deleted_ids = await hass.async_add_executor_job(
+                    storage.delete_alarm_by_name, name
+                )
+                count = len(deleted_ids)
                 if count > 0:
+                    # Unschedule the deleted alarms in alarm manager
+                    alarm_manager = _get_alarm_manager(hass)
+                    if alarm_manager:
+                        for deleted_id in deleted_ids:
+                            alarm_manager.cancel_alarm(deleted_id)
                     return self.wrap_response(
                         {
                             "success": True,
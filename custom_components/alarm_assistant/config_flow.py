@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections import ChainMap
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
@@ -30,6 +31,44 @@ from .const import (
 if TYPE_CHECKING:  # pragma: no cover
     from homeassistant.config_entries import ConfigEntry, OptionsFlow
 
+# Field validators shared by both flow steps, built once at import
+# A dict gives O(1) membership checks while keeping the dropdown order; a
+# frozenset would shuffle the options shown in the form
+_SOUND_VALIDATOR = vol.In({sound: sound for sound in ALARM_SOUNDS})
+_VOLUME_VALIDATOR = vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0))
+_SNOOZE_DURATION_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=60))
+_AUTO_DISMISS_DURATION_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=120))
+_MEDIA_PLAYER_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain="media_player")
+)
+
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ALARM_ENABLED, default=True): bool,
+        vol.Optional(CONF_MEDIA_PLAYER): _MEDIA_PLAYER_SELECTOR,
+        vol.Optional(
+            CONF_ALARM_SOUND, default=SERVICE_DEFAULTS[CONF_ALARM_SOUND]
+        ): _SOUND_VALIDATOR,
+        vol.Optional(
+            CONF_ALARM_VOLUME, default=SERVICE_DEFAULTS[CONF_ALARM_VOLUME]
+        ): _VOLUME_VALIDATOR,
+        vol.Optional(
+            CONF_SNOOZE_DURATION,
+            default=DEFAULT_SNOOZE_DURATION,
+            description="Snooze duration in minutes",
+        ): _SNOOZE_DURATION_VALIDATOR,
+        vol.Optional(
+            CONF_AUTO_DISMISS_DURATION,
+            default=DEFAULT_AUTO_DISMISS_DURATION,
+            description="Auto-dismiss alarm after this many minutes",
+        ): _AUTO_DISMISS_DURATION_VALIDATOR,
+        vol.Optional(
+            "custom_sound_path",
+            description="Custom sound file path (e.g., /local/my_sounds/alarm.mp3 or http://...)",
+        ): str,
+    }
+)
+
 
 class AlarmAssistantConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for the Voice Alarm Assistant integration."""
@@ -47,43 +86,9 @@ class AlarmAssistantConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="single_instance_allowed")
 
         if user_input is None:
-            # Get all media player entities
-            media_players = []
-            for state in self.hass.states.async_all("media_player"):
-                media_players.append(state.entity_id)
-
-            schema = vol.Schema(
-                {
-                    vol.Required(CONF_ALARM_ENABLED, default=True): bool,
-                    vol.Optional(CONF_MEDIA_PLAYER): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="media_player")
-                    ),
-                    vol.Optional(
-                        CONF_ALARM_SOUND, default=SERVICE_DEFAULTS[CONF_ALARM_SOUND]
-                    ): vol.In(ALARM_SOUNDS),
-                    vol.Optional(
-                        CONF_ALARM_VOLUME, default=SERVICE_DEFAULTS[CONF_ALARM_VOLUME]
-                    ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
-                    vol.Optional(
-                        CONF_SNOOZE_DURATION,
-                        default=DEFAULT_SNOOZE_DURATION,
-                        description="Snooze duration in minutes",
-                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
-                    vol.Optional(
-                        CONF_AUTO_DISMISS_DURATION,
-                        default=DEFAULT_AUTO_DISMISS_DURATION,
-                        description="Auto-dismiss alarm after this many minutes",
-                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
-                    vol.Optional(
-                        "custom_sound_path",
-                        description="Custom sound file path (e.g., /local/my_sounds/alarm.mp3 or http://...)",
-                    ): str,
-                }
-            )
-
             return self.async_show_form(
                 step_id="user",
-                data_schema=schema,
+                data_schema=_USER_SCHEMA,
                 errors=errors,
             )
 
@@ -118,10 +123,8 @@ class AlarmAssistantOptionsFlow(config_entries.OptionsFlow):
             # Update the config entry with new options
             return self.async_create_entry(data=user_input)
 
-        # Get current values
-        data = self._config_entry.data
-        opts = self._config_entry.options or {}
-        defaults = {**data, **opts}
+        # Get current values, options taking precedence over the initial data
+        defaults = ChainMap(self._config_entry.options or {}, self._config_entry.data)
 
         schema = vol.Schema(
             {
@@ -132,27 +135,25 @@ class AlarmAssistantOptionsFlow(config_entries.OptionsFlow):
                 vol.Optional(
                     CONF_MEDIA_PLAYER,
                     default=defaults.get(CONF_MEDIA_PLAYER),
-                ): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain="media_player")
-                ),
+                ): _MEDIA_PLAYER_SELECTOR,
                 vol.Optional(
                     CONF_ALARM_SOUND,
                     default=defaults.get(CONF_ALARM_SOUND, SERVICE_DEFAULTS[CONF_ALARM_SOUND]),
-                ): vol.In(ALARM_SOUNDS),
+                ): _SOUND_VALIDATOR,
                 vol.Optional(
                     CONF_ALARM_VOLUME,
                     default=defaults.get(CONF_ALARM_VOLUME, SERVICE_DEFAULTS[CONF_ALARM_VOLUME]),
-                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+                ): _VOLUME_VALIDATOR,
                 vol.Optional(
                     CONF_SNOOZE_DURATION,
                     default=defaults.get(CONF_SNOOZE_DURATION, DEFAULT_SNOOZE_DURATION),
                     description="Snooze duration in minutes",
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                ): _SNOOZE_DURATION_VALIDATOR,
                 vol.Optional(
                     CONF_AUTO_DISMISS_DURATION,
                     default=defaults.get(CONF_AUTO_DISMISS_DURATION, DEFAULT_AUTO_DISMISS_DURATION),
                     description="Auto-dismiss alarm after this many minutes",
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+                ): _AUTO_DISMISS_DURATION_VALIDATOR,
                 vol.Optional(
                     "custom_sound_path",
                     default=defaults.get("custom_sound_path", ""),
@@ -3,6 +3,7 @@ Constants for the Alarm Assistant custom component.
 
 This module defines configuration keys and domain names for alarm management.
 """
+from types import MappingProxyType
 
 DOMAIN = "alarm_assistant"
 ADDON_NAME = "Voice Alarm Assistant"
@@ -30,21 +31,45 @@ CONF_ALARM_VOLUME = "alarm_volume"
 CONF_MEDIA_PLAYER = "media_player_entity"
 
 # Service defaults
-SERVICE_DEFAULTS = {
+SERVICE_DEFAULTS = MappingProxyType({
     CONF_ALARM_VOLUME: 0.5,
     CONF_ALARM_SOUND: "default",
     CONF_MEDIA_PLAYER: None,
-}
+})
+
+# Shared read-only default for a missing integration config
+EMPTY_CONFIG = MappingProxyType({})
 
 # Alarm sound options
-ALARM_SOUNDS = [
+ALARM_SOUNDS = (
     "default",
     "gentle",
     "beep",
     "chime",
     "bell",
     "custom",
-]
+)
+
+# Sound names mapped to the media files they play
+SOUND_FILES = {
+    "default": "/local/alarm_sounds/default.mp3",
+    "gentle": "/local/alarm_sounds/gentle.mp3",
+    "beep": "/local/alarm_sounds/beep.mp3",
+    "chime": "/local/alarm_sounds/chime.mp3",
+    "bell": "/local/alarm_sounds/bell.mp3",
+}
+CUSTOM_SOUND_FILE = "/local/alarm_sounds/custom.mp3"
+
+# Repeat day abbreviations mapped to their weekday number (Monday = 0)
+DAY_MAP = {
+    "mon": 0,
+    "tue": 1,
+    "wed": 2,
+    "thu": 3,
+    "fri": 4,
+    "sat": 5,
+    "sun": 6,
+}
 
 # Timer constants
 CONF_TIMER_ENABLED = "timer_enabled"
@@ -1,6 +1,7 @@
 """LLM function implementations for alarm services."""
 
 import logging
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.core import HomeAssistant
@@ -19,6 +20,20 @@ from .timer_tools import CancelTimerTool, ListTimersTool, SetTimerTool
 
 _LOGGER = logging.getLogger(__name__)
 
+# The tools hold no per-call state, so one instance of each is shared
+_ALARM_TOOLS = (
+    SetAlarmTool(),
+    ListAlarmsTool(),
+    DeleteAlarmTool(),
+    StopAlarmTool(),
+    SnoozeAlarmTool(),
+)
+_TIMER_TOOLS = (
+    SetTimerTool(),
+    ListTimersTool(),
+    CancelTimerTool(),
+)
+
 
 class AlarmAPI(llm.API):
     """Alarm management API for LLM integration."""
@@ -34,25 +49,16 @@ class AlarmAPI(llm.API):
         if entry:
             config_data = {**config_data, **entry.options}
 
-        tools = []
         alarm_enabled = config_data.get(CONF_ALARM_ENABLED, True)
         timer_enabled = config_data.get(CONF_TIMER_ENABLED, True)
 
+        tools = []
+
         if alarm_enabled:
-            tools.extend([
-                SetAlarmTool(),
-                ListAlarmsTool(),
-                DeleteAlarmTool(),
-                StopAlarmTool(),
-                SnoozeAlarmTool(),
-            ])
+            tools.extend(_ALARM_TOOLS)
 
         if timer_enabled:
-            tools.extend([
-                SetTimerTool(),
-                ListTimersTool(),
-                CancelTimerTool(),
-            ])
+            tools.extend(_TIMER_TOOLS)
 
         return tools
 
@@ -87,7 +93,9 @@ async def setup_llm_functions(hass: HomeAssistant, config_data: dict[str, Any])
     alarm_api = AlarmAPI(hass, ALARM_API_NAME)
 
     hass.data[DOMAIN]["api"] = alarm_api
-    hass.data[DOMAIN]["config"] = config_data.copy()
+    # Callers build a fresh merged dict per setup, so a read-only view of it
+    # is enough
+    hass.data[DOMAIN]["config"] = MappingProxyType(config_data)
 
     # Register the API with Home Assistant's LLM system
     try:
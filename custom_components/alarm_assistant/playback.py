@@ -0,0 +1,28 @@
+"""Sound playback shared by the alarm and timer managers."""
+from homeassistant.core import HomeAssistant
+
+
+async def async_play_sound(
+    hass: HomeAssistant, media_player: str, sound_file: str, volume: float
+):
+    """Set the volume of a media player and play a sound file on it."""
+    # Neither call waits for the player, so volume_set and play_media run
+    # concurrently and the volume change may land just after playback starts
+    await hass.services.async_call(
+        "media_player",
+        "volume_set",
+        {"entity_id": media_player, "volume_level": volume},
+        blocking=False,
+    )
+
+    # Play sound
+    await hass.services.async_call(
+        "media_player",
+        "play_media",
+        {
+            "entity_id": media_player,
+            "media_content_id": sound_file,
+            "media_content_type": "music",
+        },
+        blocking=False,
+    )
@@ -3,8 +3,17 @@ import logging
 
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_ALARM_VOLUME, CONF_MEDIA_PLAYER, CONF_TIMER_SOUND, DOMAIN
-from .timer_storage import TimerStorage
+from .const import (
+    CONF_ALARM_VOLUME,
+    CONF_MEDIA_PLAYER,
+    CONF_TIMER_SOUND,
+    CUSTOM_SOUND_FILE,
+    DOMAIN,
+    EMPTY_CONFIG,
+    SOUND_FILES,
+)
+from .playback import async_play_sound
+from .timer_storage import TIMER_STORAGE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,16 +24,17 @@ class TimerManager:
     def __init__(self, hass: HomeAssistant):
         """Initialize the timer manager."""
         self.hass = hass
-        self.storage = TimerStorage()
+        self.storage = TIMER_STORAGE
+        self._domain_data = hass.data.setdefault(DOMAIN, {})
 
     async def trigger_timer(self, timer_id: int):
         """Trigger a timer (play sound, send notification, etc.)."""
         timer = self.storage.get_timer(timer_id)
-        if not timer or not timer["active"]:
+        if not timer or not timer.active:
             return
 
-        timer_name = timer["name"]
-        timer_sound = timer.get("sound", "default")
+        timer_name = timer.name
+        timer_sound = timer.sound
 
         _LOGGER.info("Timer completed: %d (%s)", timer_id, timer_name)
 
@@ -46,7 +56,7 @@ class TimerManager:
 
     async def _play_timer_sound(self, sound: str):
         """Play the timer sound using a media player."""
-        config_data = self.hass.data.get(DOMAIN, {}).get("config", {})
+        config_data = self._domain_data.get("config", EMPTY_CONFIG)
         media_player = config_data.get(CONF_MEDIA_PLAYER)
         volume = config_data.get(CONF_ALARM_VOLUME, 0.5)
 
@@ -57,41 +67,11 @@ class TimerManager:
         try:
             # Get custom file path if sound is "custom"
             if sound == "custom":
-                custom_path = config_data.get("custom_sound_path")
-                if custom_path:
-                    sound_file = custom_path
-                else:
-                    sound_file = "/local/alarm_sounds/custom.mp3"
+                sound_file = config_data.get("custom_sound_path") or CUSTOM_SOUND_FILE
             else:
-                # Map sound names to file paths
-                sound_map = {
-                    "default": "/local/alarm_sounds/default.mp3",
-                    "gentle": "/local/alarm_sounds/gentle.mp3",
-                    "beep": "/local/alarm_sounds/beep.mp3",
-                    "chime": "/local/alarm_sounds/chime.mp3",
-                    "bell": "/local/alarm_sounds/bell.mp3",
-                }
-                sound_file = sound_map.get(sound, sound_map["default"])
-
-            # Set volume
-            await self.hass.services.async_call(
-                "media_player",
-                "volume_set",
-                {"entity_id": media_player, "volume_level": volume},
-                blocking=True,
-            )
+                sound_file = SOUND_FILES.get(sound, SOUND_FILES["default"])
 
-            # Play sound
-            await self.hass.services.async_call(
-                "media_player",
-                "play_media",
-                {
-                    "entity_id": media_player,
-                    "media_content_id": sound_file,
-                    "media_content_type": "music",
-                },
-                blocking=False,
-            )
+            await async_play_sound(self.hass, media_player, sound_file, volume)
 
             _LOGGER.info("Playing timer sound: %s on %s", sound, media_player)
 
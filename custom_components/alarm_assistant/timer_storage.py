@@ -1,17 +1,47 @@
 """Timer storage and management using in-memory storage."""
+import heapq
 import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class Timer:
+    """A countdown timer held in memory."""
+
+    id: int
+    name: str
+    name_lower: str
+    duration_seconds: int
+    start_time: datetime
+    end_time: datetime
+    end_monotonic: float
+    sound: str
+    active: bool = True
+    # Cancels the scheduled completion callback, once one is attached
+    cancel: Callable[[], None] | None = None
+
+
 class TimerStorage:
     """Singleton class for managing timers in memory."""
 
     _instance = None
+    # All known timers by ID, plus the subset that is still running so scans
+    # over active timers never walk completed or cancelled ones
     _timers = {}
+    _active = {}
+    # Lowercased names of active timers mapped to their IDs; timers often
+    # share a name, so name matching only has to look at distinct names
+    _by_name_lower = {}
+    # (end_monotonic, timer_id) ordered by end time, for cleanup
+    _cleanup_heap = []
     _next_id = 1
+    # Bumped whenever the set of active timers changes
+    version = 0
 
     def __new__(cls):
         if cls._instance is None:
@@ -38,18 +68,27 @@ class TimerStorage:
         timer_id = self._next_id
         self._next_id += 1
 
+        # Remaining time is tracked on the monotonic clock; the wall-clock end
+        # time is only kept for display
         start_time = datetime.now()
         end_time = start_time + timedelta(seconds=duration_seconds)
+        end_monotonic = time.monotonic() + duration_seconds
 
-        self._timers[timer_id] = {
-            "id": timer_id,
-            "name": name,
-            "duration_seconds": duration_seconds,
-            "start_time": start_time,
-            "end_time": end_time,
-            "sound": sound,
-            "active": True,
-        }
+        timer = Timer(
+            id=timer_id,
+            name=name,
+            name_lower=name.lower(),
+            duration_seconds=duration_seconds,
+            start_time=start_time,
+            end_time=end_time,
+            end_monotonic=end_monotonic,
+            sound=sound,
+        )
+        self._timers[timer_id] = timer
+        self._active[timer_id] = timer
+        self._by_name_lower.setdefault(timer.name_lower, set()).add(timer_id)
+        heapq.heappush(self._cleanup_heap, (end_monotonic, timer_id))
+        self.version += 1
 
         logger.info(
             "Created timer: %s for %d seconds (ID: %d, ends at: %s)",
@@ -60,14 +99,36 @@ class TimerStorage:
         )
         return timer_id, end_time
 
-    def get_all_timers(self) -> list[dict[str, Any]]:
+    def attach_cancel(self, timer_id: int, cancel: Callable[[], None]):
+        """Attach the function that cancels a timer's scheduled callback."""
+        timer = self._active.get(timer_id)
+        if timer:
+            timer.cancel = cancel
+        else:
+            # Cancelled before it was scheduled; drop the callback right away
+            cancel()
+
+    def get_all_timers(self) -> list[Timer]:
         """Get all active timers."""
+        return list(self._active.values())
+
+    def snapshot_with_remaining(self) -> list[tuple[int, str, int]]:
+        """
+        Get the active timers that still have time left.
+
+        The clock is read once for the whole snapshot.
+
+        Returns:
+            List of (id, name, remaining_seconds) tuples
+        """
+        now = time.monotonic()
         return [
-            timer for timer in self._timers.values()
-            if timer["active"]
+            (timer.id, timer.name, remaining)
+            for timer in self._active.values()
+            if (remaining := int(timer.end_monotonic - now)) > 0
         ]
 
-    def get_timer(self, timer_id: int) -> dict[str, Any] | None:
+    def get_timer(self, timer_id: int) -> Timer | None:
         """Get a specific timer by ID."""
         return self._timers.get(timer_id)
 
@@ -82,7 +143,7 @@ class TimerStorage:
             True if timer was cancelled, False if not found
         """
         if timer_id in self._timers:
-            self._timers[timer_id]["active"] = False
+            self._deactivate(timer_id)
             logger.info("Cancelled timer with ID: %d", timer_id)
             return True
         logger.warning("Timer with ID %d not found", timer_id)
@@ -98,11 +159,16 @@ class TimerStorage:
         Returns:
             Number of timers cancelled
         """
-        count = 0
-        for timer in self._timers.values():
-            if timer["active"] and name.lower() in timer["name"].lower():
-                timer["active"] = False
-                count += 1
+        needle = name.lower()
+        matched = [
+            tid
+            for name_lower, ids in self._by_name_lower.items()
+            if needle in name_lower
+            for tid in ids
+        ]
+        for tid in matched:
+            self._deactivate(tid)
+        count = len(matched)
         logger.info("Cancelled %d timer(s) matching name: %s", count, name)
         return count
 
@@ -113,11 +179,19 @@ class TimerStorage:
         Returns:
             Number of timers cancelled
         """
-        count = 0
-        for timer in self._timers.values():
-            if timer["active"]:
-                timer["active"] = False
-                count += 1
+        count = len(self._active)
+        if count:
+            self.version += 1
+        self._by_name_lower.clear()
+        # Pop timers one by one so each is out of the index before its
+        # callback is cancelled and its reference is released right away
+        active = self._active
+        while active:
+            _, timer = active.popitem()
+            timer.active = False
+            if timer.cancel:
+                timer.cancel()
+                timer.cancel = None
         logger.info("Cancelled all timers (%d total)", count)
         return count
 
@@ -132,7 +206,7 @@ class TimerStorage:
             True if timer was marked complete, False if not found
         """
         if timer_id in self._timers:
-            self._timers[timer_id]["active"] = False
+            self._deactivate(timer_id)
             logger.info("Timer %d completed", timer_id)
             return True
         return False
@@ -147,21 +221,48 @@ class TimerStorage:
         Returns:
             Remaining seconds or None if not found
         """
-        timer = self._timers.get(timer_id)
-        if not timer or not timer["active"]:
+        timer = self._active.get(timer_id)
+        if not timer:
             return None
 
-        remaining = (timer["end_time"] - datetime.now()).total_seconds()
-        return max(0, int(remaining))
+        return max(0, int(timer.end_monotonic - time.monotonic()))
+
+    def _deactivate(self, timer_id: int):
+        """Mark a timer inactive, cancel its callback and drop it from the index."""
+        timer = self._timers[timer_id]
+        timer.active = False
+        if timer.cancel:
+            timer.cancel()
+            timer.cancel = None
+        if self._active.pop(timer_id, None) is not None:
+            self.version += 1
+            ids = self._by_name_lower[timer.name_lower]
+            ids.discard(timer_id)
+            if not ids:
+                del self._by_name_lower[timer.name_lower]
 
     def cleanup_completed(self):
         """Remove completed/cancelled timers older than 1 hour."""
-        cutoff = datetime.now() - timedelta(hours=1)
-        to_remove = [
-            tid for tid, timer in self._timers.items()
-            if not timer["active"] and timer["end_time"] < cutoff
-        ]
-        for tid in to_remove:
-            del self._timers[tid]
-        if to_remove:
-            logger.debug("Cleaned up %d old timers", len(to_remove))
+        cutoff = time.monotonic() - 3600
+        heap = self._cleanup_heap
+        removed = 0
+        still_active = []
+        # Only timers that ended before the cutoff are looked at
+        while heap and heap[0][0] < cutoff:
+            entry = heapq.heappop(heap)
+            timer = self._timers.get(entry[1])
+            if timer is None:
+                continue
+            if timer.active:
+                still_active.append(entry)
+                continue
+            del self._timers[entry[1]]
+            removed += 1
+        for entry in still_active:
+            heapq.heappush(heap, entry)
+        if removed:
+            logger.debug("Cleaned up %d old timers", removed)
+
+
+# The shared instance; import this rather than calling TimerStorage()
+TIMER_STORAGE = TimerStorage()
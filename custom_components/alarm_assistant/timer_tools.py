@@ -1,17 +1,61 @@
 """LLM Tools for timer management."""
 import logging
 import re
+import time
+from functools import lru_cache, partial
 
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import llm
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util.json import JsonObjectType
 
 from .const import DOMAIN
-from .timer_storage import TimerStorage
+from .timer_storage import TIMER_STORAGE
 
 _LOGGER = logging.getLogger(__name__)
 
+# Suffix for a count, indexed by `count != 1`
+_PLURAL = ("", "s")
+
+# How long a list_timers response may be reused, in seconds
+_LIST_CACHE_TTL = 0.5
+
+
+async def _on_timer_expire(hass: HomeAssistant, timer_id: int, now=None):
+    """Handle timer completion."""
+    timer_manager = hass.data[DOMAIN].get("timer_manager")
+    if timer_manager:
+        await timer_manager.trigger_timer(timer_id)
+
+
+@lru_cache(maxsize=4096)
+def _format_duration(total_seconds: int) -> str:
+    """Format duration as human readable string."""
+    hours, rest = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+
+    parts = (
+        f"{hours} hour{_PLURAL[hours != 1]}" if hours > 0 else "",
+        f"{minutes} minute{_PLURAL[minutes != 1]}" if minutes > 0 else "",
+        f"{seconds} second{_PLURAL[seconds != 1]}" if seconds > 0 else "",
+    )
+    return " ".join(part for part in parts if part) or "0 seconds"
+
+
+@lru_cache(maxsize=4096)
+def _format_remaining(seconds: int) -> str:
+    """Format remaining time as human readable string."""
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+
+    if hours > 0:
+        return f"{hours}h {minutes}m {secs}s"
+    elif minutes > 0:
+        return f"{minutes}m {secs}s"
+    else:
+        return f"{secs}s"
+
 
 class SetTimerTool(llm.Tool):
     """Tool for setting a timer."""
@@ -41,29 +85,14 @@ class SetTimerTool(llm.Tool):
                 "sound",
                 description="Optional timer completion sound. Options: default, gentle, beep, chime, bell, custom",
             ): str,
-        }
+        },
+        extra=vol.REMOVE_EXTRA,
     )
 
     def wrap_response(self, response: dict) -> dict:
         response["instruction"] = self.response_instruction
         return response
 
-    def _format_duration(self, total_seconds: int) -> str:
-        """Format duration as human readable string."""
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
-
-        parts = []
-        if hours > 0:
-            parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
-        if minutes > 0:
-            parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
-        if seconds > 0:
-            parts.append(f"{seconds} second{'s' if seconds != 1 else ''}")
-
-        return " ".join(parts) if parts else "0 seconds"
-
     async def async_call(
         self,
         hass: HomeAssistant,
@@ -87,7 +116,7 @@ class SetTimerTool(llm.Tool):
         _LOGGER.info("Setting timer: %s for %d seconds", name, total_seconds)
 
         try:
-            storage = TimerStorage()
+            storage = TIMER_STORAGE
             timer_id, end_time = storage.add_timer(
                 name=name, duration_seconds=total_seconds, sound=sound
             )
@@ -95,12 +124,12 @@ class SetTimerTool(llm.Tool):
             # Schedule the timer
             await self._schedule_timer(hass, timer_id, total_seconds)
 
-            duration_str = self._format_duration(total_seconds)
+            duration_str = _format_duration(total_seconds)
             response = {
                 "success": True,
                 "timer_id": timer_id,
                 "duration_seconds": total_seconds,
-                "end_time": end_time.strftime("%H:%M:%S"),
+                "end_time": f"{end_time.hour:02d}:{end_time.minute:02d}:{end_time.second:02d}",
                 "message": f"Timer '{name}' set for {duration_str}",
             }
 
@@ -114,23 +143,11 @@ class SetTimerTool(llm.Tool):
         self, hass: HomeAssistant, timer_id: int, duration_seconds: int
     ):
         """Schedule the timer in Home Assistant."""
-        from homeassistant.helpers.event import async_call_later
-
-        # Store timer scheduling info in hass.data
-        if DOMAIN not in hass.data:
-            hass.data[DOMAIN] = {}
-        if "scheduled_timers" not in hass.data[DOMAIN]:
-            hass.data[DOMAIN]["scheduled_timers"] = {}
-
         # Schedule timer to trigger after duration
-        async def timer_callback(now):
-            """Handle timer completion."""
-            timer_manager = hass.data[DOMAIN].get("timer_manager")
-            if timer_manager:
-                await timer_manager.trigger_timer(timer_id)
-
-        cancel_func = async_call_later(hass, duration_seconds, timer_callback)
-        hass.data[DOMAIN]["scheduled_timers"][timer_id] = cancel_func
+        cancel_func = async_call_later(
+            hass, duration_seconds, partial(_on_timer_expire, hass, timer_id)
+        )
+        TIMER_STORAGE.attach_cancel(timer_id, cancel_func)
 
 
 class ListTimersTool(llm.Tool):
@@ -145,25 +162,15 @@ class ListTimersTool(llm.Tool):
     Keep your response concise and in plain text without formatting.
     """
 
-    parameters = vol.Schema({})
+    parameters = vol.Schema({}, extra=vol.REMOVE_EXTRA)
+
+    # (monotonic time, storage version, snapshot) of the last listing
+    _cache = (0.0, -1, None)
 
     def wrap_response(self, response: dict) -> dict:
         response["instruction"] = self.response_instruction
         return response
 
-    def _format_remaining(self, seconds: int) -> str:
-        """Format remaining time as human readable string."""
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        secs = seconds % 60
-
-        if hours > 0:
-            return f"{hours}h {minutes}m {secs}s"
-        elif minutes > 0:
-            return f"{minutes}m {secs}s"
-        else:
-            return f"{secs}s"
-
     async def async_call(
         self,
         hass: HomeAssistant,
@@ -171,39 +178,43 @@ class ListTimersTool(llm.Tool):
         llm_context: llm.LLMContext,
     ) -> JsonObjectType:
         """Call the tool to list timers."""
-        _LOGGER.info("Listing all timers")
+        _LOGGER.debug("Listing all timers")
 
         try:
-            storage = TimerStorage()
-            timers = storage.get_all_timers()
-
-            if not timers:
+            storage = TIMER_STORAGE
+            # Repeated calls within the TTL reuse the same snapshot, unless a
+            # timer was added, cancelled or completed in the meantime
+            now = time.monotonic()
+            cached_at, cached_version, snapshot = ListTimersTool._cache
+            if (
+                snapshot is None
+                or cached_version != storage.version
+                or now - cached_at >= _LIST_CACHE_TTL
+            ):
+                snapshot = storage.snapshot_with_remaining()
+                ListTimersTool._cache = (now, storage.version, snapshot)
+
+            if not snapshot:
                 return self.wrap_response(
                     {"timers": [], "message": "No timers are currently running"}
                 )
 
-            timer_list = []
-            for timer in timers:
-                remaining = storage.get_remaining_seconds(timer["id"])
-                if remaining is not None and remaining > 0:
-                    timer_info = {
-                        "id": timer["id"],
-                        "name": timer["name"],
-                        "remaining_seconds": remaining,
-                        "remaining_formatted": self._format_remaining(remaining),
-                    }
-                    timer_list.append(timer_info)
-
-            if not timer_list:
-                return self.wrap_response(
-                    {"timers": [], "message": "No timers are currently running"}
-                )
+            # Build fresh response dicts, with all keys, from the plain tuples
+            timer_list = [
+                {
+                    "id": timer_id,
+                    "name": name,
+                    "remaining_seconds": remaining,
+                    "remaining_formatted": _format_remaining(remaining),
+                }
+                for timer_id, name, remaining in snapshot
+            ]
 
             return self.wrap_response(
                 {
                     "timers": timer_list,
                     "count": len(timer_list),
-                    "message": f"You have {len(timer_list)} timer{'s' if len(timer_list) != 1 else ''} running",
+                    "message": f"You have {len(timer_list)} timer{_PLURAL[len(timer_list) != 1]} running",
                 }
             )
 
@@ -236,7 +247,8 @@ class CancelTimerTool(llm.Tool):
                 "cancel_all",
                 description="Set to true to cancel all timers. Use when user says 'cancel all timers' or 'stop all timers'.",
             ): bool,
-        }
+        },
+        extra=vol.REMOVE_EXTRA,
     )
 
     def wrap_response(self, response: dict) -> dict:
@@ -254,6 +266,11 @@ class CancelTimerTool(llm.Tool):
         name = tool_input.tool_args.get("name")
         cancel_all = tool_input.tool_args.get("cancel_all", False)
 
+        if not cancel_all and timer_id is None and not name:
+            return {
+                "error": "Please specify timer_id, name, or cancel_all to cancel timers"
+            }
+
         _LOGGER.info(
             "Cancelling timer: ID=%s, name=%s, cancel_all=%s",
             timer_id,
@@ -262,36 +279,22 @@ class CancelTimerTool(llm.Tool):
         )
 
         try:
-            storage = TimerStorage()
+            storage = TIMER_STORAGE
 
             if cancel_all:
+                # Also cancels the scheduled callbacks
                 count = storage.cancel_all_timers()
-                # Cancel scheduled callbacks
-                if DOMAIN in hass.data and "scheduled_timers" in hass.data[DOMAIN]:
-                    for cancel_func in hass.data[DOMAIN]["scheduled_timers"].values():
-                        cancel_func()
-                    hass.data[DOMAIN]["scheduled_timers"].clear()
                 return self.wrap_response(
                     {
                         "success": True,
                         "cancelled_count": count,
-                        "message": f"Cancelled all {count} timer{'s' if count != 1 else ''}",
+                        "message": f"Cancelled all {count} timer{_PLURAL[count != 1]}",
                     }
                 )
 
             if timer_id is not None:
                 success = storage.cancel_timer(timer_id)
                 if success:
-                    # Cancel scheduled callback
-                    if (
-                        DOMAIN in hass.data
-                        and "scheduled_timers" in hass.data[DOMAIN]
-                    ):
-                        cancel_func = hass.data[DOMAIN]["scheduled_timers"].pop(
-                            timer_id, None
-                        )
-                        if cancel_func:
-                            cancel_func()
                     return self.wrap_response(
                         {
                             "success": True,
@@ -301,21 +304,16 @@ class CancelTimerTool(llm.Tool):
                     )
                 return {"error": f"Timer with ID {timer_id} not found"}
 
-            if name:
-                count = storage.cancel_timer_by_name(name)
-                if count > 0:
-                    return self.wrap_response(
-                        {
-                            "success": True,
-                            "cancelled_count": count,
-                            "message": f"Cancelled {count} timer{'s' if count != 1 else ''} matching '{name}'",
-                        }
-                    )
-                return {"error": f"No timers found matching '{name}'"}
-
-            return {
-                "error": "Please specify timer_id, name, or cancel_all to cancel timers"
-            }
+            count = storage.cancel_timer_by_name(name)
+            if count > 0:
+                return self.wrap_response(
+                    {
+                        "success": True,
+                        "cancelled_count": count,
+                        "message": f"Cancelled {count} timer{_PLURAL[count != 1]} matching '{name}'",
+                    }
+                )
+            return {"error": f"No timers found matching '{name}'"}
 
         except Exception as e:
             _LOGGER.error("Error cancelling timer: %s", e)